@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import os
 from typing import Any
 
 from bot.admin import update_application_fields
@@ -19,7 +19,7 @@ from bot.constants import (
     SKIP_KEYWORD,
 )
 from bot.logging import logger
-from bot.media_storage import get_media_storage
+from bot.media_storage import get_media_storage, photo_suffix
 from bot.messages import get_message
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.error import BadRequest, TelegramError
@@ -366,10 +366,11 @@ async def receive_photo_upload(
 
     try:
         telegram_file = await context.bot.get_file(message.photo[-1].file_id)
-        suffix = Path(telegram_file.file_path or "").suffix or ".jpg"
-        filename = f"update_{len(photos) + 1:02d}{suffix}"
+        filename = (
+            f"update_{len(photos) + 1:02d}{photo_suffix(telegram_file.file_path)}"
+        )
         target_path = storage.allocate_path(session, filename)
-        await telegram_file.download_to_drive(custom_path=str(target_path))
+        await telegram_file.download_to_drive(custom_path=os.fspath(target_path))
         handle = storage.finalize_upload(session, target_path)
         photos.append(handle)
         logger.info(
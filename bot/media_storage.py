@@ -37,6 +37,20 @@ def _resolve_within(base: Path, relative: str) -> Path:
     return target
 
 
+_DEFAULT_PHOTO_SUFFIX = ".jpg"
+
+
+def photo_suffix(file_path: str | None) -> str:
+    """Return the extension of a Telegram ``file_path`` or ``.jpg`` if it has none."""
+
+    if not file_path:
+        return _DEFAULT_PHOTO_SUFFIX
+    dot = file_path.rfind(".")
+    if dot <= file_path.rfind("/") + 1 or dot == len(file_path) - 1:
+        return _DEFAULT_PHOTO_SUFFIX
+    return file_path[dot:]
+
+
 class MediaStorage(ABC):
     """Abstract base class describing media storage capabilities."""
 
@@ -369,4 +383,5 @@ __all__ = [
     "MinioMediaStorage",
     "create_media_storage",
     "get_media_storage",
+    "photo_suffix",
 ]
@@ -6,11 +6,11 @@ from watchfiles import PythonFilter, run_process
 
 
 def main() -> None:
-    """Run the bot with automatic reload on Python file changes."""
+    """Run the bot with automatic reload on Python or message catalog changes."""
     run_process(
         "bot",
         target="python -m bot.main",
-        watch_filter=PythonFilter(),
+        watch_filter=PythonFilter(extra_extensions=(".toml",)),
     )
 
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Iterable, Mapping
 
 from bot.logging import logger
 from telegram.ext import ContextTypes
@@ -14,6 +14,8 @@ from valkey import Valkey
 class InMemoryValkey:
     """Fallback store that mimics the subset of Valkey used by the bot."""
 
+    __slots__ = ("_hashes", "_sets")
+
     def __init__(self) -> None:
         self._hashes: dict[str, dict[str, str]] = {}
         self._sets: dict[str, set[str]] = {}
@@ -37,6 +39,10 @@ class InMemoryValkey:
     def hgetall(self, name: str) -> dict[str, str]:
         return self._hashes.get(name, {}).copy()
 
+    def hmget(self, name: str, keys: Iterable[str]) -> list[str | None]:
+        target = self._hashes.get(name, {})
+        return [target.get(key) for key in keys]
+
     def sadd(self, name: str, key: str) -> int:
         target = self._sets.setdefault(name, set())
         before = len(target)
@@ -50,8 +56,10 @@ class InMemoryValkey:
         target.remove(key)
         return 1
 
-    def smembers(self, name: str) -> set[str]:
-        return self._sets.get(name, set()).copy()
+    def smembers(self, name: str) -> frozenset[str]:
+        # Real Valkey returns a fresh ``set[bytes]``; callers only iterate or
+        # test membership, so an immutable snapshot is enough here.
+        return frozenset(self._sets.get(name, ()))
 
     def delete(self, *names: str) -> None:
         for name in names:
@@ -61,12 +69,48 @@ class InMemoryValkey:
     def ping(self) -> bool:
         return True
 
+    def flushall(self) -> None:
+        self._hashes.clear()
+        self._sets.clear()
+
+    def pipeline(self, transaction: bool = True) -> _InMemoryPipeline:
+        return _InMemoryPipeline(self)
+
+
+class _InMemoryPipeline:
+    """Queue commands against :class:`InMemoryValkey` until ``execute`` runs."""
+
+    __slots__ = ("_client", "_commands")
+
+    def __init__(self, client: InMemoryValkey) -> None:
+        self._client = client
+        self._commands: list[tuple[Callable[..., Any], tuple, dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., _InMemoryPipeline]:
+        method = getattr(self._client, name)
+
+        def queue(*args: Any, **kwargs: Any) -> _InMemoryPipeline:
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[Any]:
+        commands, self._commands = self._commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+    def __enter__(self) -> _InMemoryPipeline:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._commands.clear()
+
 
 class ApplicationStore:
     """Read/write per-user submission state backed by Valkey."""
 
-    _LIST_FIELDS = {"photos"}
-    _INT_FIELDS = {"_photo_prompt_message_id"}
+    _LIST_FIELDS = frozenset({"photos"})
+    _INT_FIELDS = frozenset({"_photo_prompt_message_id"})
 
     def __init__(self, client: Valkey | InMemoryValkey, prefix: str) -> None:
         self._client = client
@@ -128,16 +172,44 @@ class ApplicationStore:
         )
         return session
 
+    def get_fields(self, user_id: int, *fields: str) -> dict[str, Any]:
+        """Load only ``fields`` of the session instead of the whole hash."""
+
+        key = self._session_key(user_id)
+        values = self._client.hmget(key, list(fields))
+        raw = {
+            field: value
+            for field, value in zip(fields, values, strict=True)
+            if value is not None
+        }
+        if not raw:
+            logger.debug("No existing session found for user {}", user_id)
+            return {}
+        session = self._deserialize(raw)
+        if "photos" in fields:
+            session.setdefault("photos", [])
+        logger.debug(
+            "Loaded session fields {} for user {} from {}",
+            sorted(session.keys()),
+            user_id,
+            key,
+        )
+        return session
+
     def clear(self, user_id: int) -> None:
         self._client.delete(self._session_key(user_id))
         logger.debug("Cleared session for user {}", user_id)
 
     def _serialize(self, data: dict[str, Any]) -> dict[str, str]:
+        list_fields = self._LIST_FIELDS
+        int_fields = self._INT_FIELDS
         serialized: dict[str, str] = {}
         for field, value in data.items():
-            if field in self._LIST_FIELDS:
+            if type(value) is str and field not in list_fields:
+                serialized[field] = value
+            elif field in list_fields:
                 serialized[field] = json.dumps([str(item) for item in value])
-            elif field in self._INT_FIELDS:
+            elif field in int_fields:
                 serialized[field] = "" if value is None else str(value)
             elif isinstance(value, Path):
                 serialized[field] = str(value)
@@ -148,17 +220,19 @@ class ApplicationStore:
         return serialized
 
     def _deserialize(self, data: Mapping[str | bytes, str | bytes]) -> dict[str, Any]:
+        list_fields = self._LIST_FIELDS
+        int_fields = self._INT_FIELDS
         result: dict[str, Any] = {}
         for raw_key, raw_value in data.items():
             key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
             value = raw_value.decode() if isinstance(raw_value, bytes) else raw_value
-            if key in self._LIST_FIELDS:
+            if key in list_fields:
                 if value:
                     items = json.loads(value)
                     result[key] = [str(item) for item in items]
                 else:
                     result[key] = []
-            elif key in self._INT_FIELDS:
+            elif key in int_fields:
                 result[key] = int(value) if value else None
             elif key == "session_dir":
                 result[key] = Path(value) if value else None
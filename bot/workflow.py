@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
@@ -20,7 +23,7 @@ from bot.constants import (
     UTC,
 )
 from bot.logging import logger
-from bot.media_storage import get_media_storage
+from bot.media_storage import get_media_storage, photo_suffix
 from bot.messages import get_message
 from bot.storage import get_application_store
 from telegram import (
@@ -35,6 +38,21 @@ from telegram.ext import ContextTypes, ConversationHandler
 from valkey import Valkey
 from valkey.exceptions import ValkeyError
 
+# File name and bytes of a photo read once and reused for every recipient.
+_PhotoPayload = tuple[str, bytes]
+
+_SUBMISSION_FIELDS = (
+    "session_key",
+    "session_dir",
+    "photos",
+    "position",
+    "condition",
+    "size",
+    "material",
+    "description",
+    "price",
+)
+
 
 async def get_position(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
@@ -118,10 +136,10 @@ async def get_photos(update: Update, context: ContextTypes.DEFAULT_TYPE):
     photo_index = len(user_data.get("photos", [])) + 1
 
     telegram_file = await context.bot.get_file(update.message.photo[-1].file_id)
-    file_suffix = Path(telegram_file.file_path or "").suffix or ".jpg"
-    filename = f"photo_{photo_index:02d}{file_suffix}"
-    target_path = storage.allocate_path(session, filename)
-    await telegram_file.download_to_drive(custom_path=str(target_path))
+    target_path = storage.allocate_path(
+        session, f"photo_{photo_index:02d}{photo_suffix(telegram_file.file_path)}"
+    )
+    await telegram_file.download_to_drive(custom_path=os.fspath(target_path))
     handle = storage.finalize_upload(session, target_path)
     logger.info(
         "Saved photo {} for user {} as {}",
@@ -249,7 +267,7 @@ async def get_contacts(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
 
     store = get_application_store(context)
-    user_data = store.get(user.id)
+    user_data = store.get_fields(user.id, *_SUBMISSION_FIELDS)
     if not user_data:
         logger.warning("Contacts handler could not locate session for user {}", user.id)
         await update.message.reply_text(get_message("general.session_missing"))
@@ -278,14 +296,18 @@ async def get_contacts(update: Update, context: ContextTypes.DEFAULT_TYPE):
     photo_handles: list[str] = list(user_data.get("photos", []))
     logger.debug("User {} submission includes {} photos", user.id, len(photo_handles))
 
+    photos = await _load_photo_payloads(
+        _resolve_submission_photos(context, photo_handles)
+    )
+
     chat = update.effective_chat
     chat_id = chat.id if chat is not None else user.id
-    await _send_submission_photos(context, chat_id, photo_handles)
+    await _send_photo_payloads(context.bot, chat_id, photos)
 
     await update.message.reply_text(text, parse_mode="Markdown")
 
     _persist_application(update, context, user_data)
-    await _forward_to_moderators(context, text, photo_handles)
+    await _forward_to_moderators(context, text, photos)
     await update.message.reply_text(
         get_message("workflow.submission_received"), parse_mode="Markdown"
     )
@@ -348,7 +370,7 @@ async def _send_photo_prompt(
 async def _forward_to_moderators(
     context: ContextTypes.DEFAULT_TYPE,
     text: str,
-    photo_handles: list[str],
+    photos: list[_PhotoPayload],
 ) -> None:
     chat_ids: list[int] = context.application.bot_data.get("moderator_chat_ids") or []
     if not chat_ids:
@@ -357,7 +379,7 @@ async def _forward_to_moderators(
 
     for chat_id in chat_ids:
         try:
-            await _send_submission_photos(context, chat_id, photo_handles)
+            await _send_photo_payloads(context.bot, chat_id, photos)
             await context.bot.send_message(
                 chat_id=chat_id,
                 text=text,
@@ -375,81 +397,100 @@ async def _send_submission_photos(
     chat_id: int,
     photo_handles: list[str],
 ) -> None:
-    storage = get_media_storage(context)
-    cached_paths = storage.cache_photos(photo_handles)
-    existing_photos = [photo_path for photo_path in cached_paths if photo_path.exists()]
-    if not existing_photos:
+    photos = await _load_photo_payloads(
+        _resolve_submission_photos(context, photo_handles)
+    )
+    await _send_photo_payloads(context.bot, chat_id, photos)
+
+
+def _resolve_submission_photos(
+    context: ContextTypes.DEFAULT_TYPE,
+    photo_handles: list[str],
+) -> list[Path]:
+    """Cache ``photo_handles`` locally; ``cache_photos`` drops missing files."""
+
+    return get_media_storage(context).cache_photos(photo_handles)
+
+
+def _read_photo(photo_path: Path) -> _PhotoPayload | None:
+    try:
+        return photo_path.name, photo_path.read_bytes()
+    except OSError:
+        logger.warning("Skipping unreadable photo {}", photo_path)
+        return None
+
+
+async def _load_photo_payloads(photo_paths: list[Path]) -> list[_PhotoPayload]:
+    """Read photos once on worker threads so every send reuses the bytes."""
+
+    payloads = await asyncio.gather(
+        *(asyncio.to_thread(_read_photo, photo_path) for photo_path in photo_paths)
+    )
+    return [payload for payload in payloads if payload is not None]
+
+
+def _photo_buffer(photo: _PhotoPayload) -> BytesIO:
+    name, payload = photo
+    buffer = BytesIO(payload)
+    buffer.name = name  # type: ignore[attr-defined]
+    return buffer
+
+
+async def _send_photo_payloads(
+    bot: Bot,
+    chat_id: int,
+    photos: list[_PhotoPayload],
+) -> None:
+    """Send already loaded photos, wrapping fresh buffers for this chat."""
+
+    if not photos:
         logger.debug("No existing photos to send to chat {}", chat_id)
         return
 
     logger.debug(
         "Sending {} photos to chat {}",
-        len(existing_photos),
+        len(photos),
         chat_id,
     )
-    bot = context.bot
-    if len(existing_photos) > 1:
-        media_group: list[InputMediaPhoto] = []
-        open_files = []
+    if len(photos) > 1:
+        media_group = [InputMediaPhoto(media=_photo_buffer(photo)) for photo in photos]
         try:
-            for photo_path in existing_photos:
-                photo_file = photo_path.open("rb")
-                photo_file.seek(0)
-                open_files.append(photo_file)
-                media_group.append(InputMediaPhoto(media=photo_file))
-            try:
-                await bot.send_media_group(chat_id=chat_id, media=media_group)
-                logger.debug(
-                    "Sent media group with {} photos to chat {}",
-                    len(existing_photos),
-                    chat_id,
-                )
-                return
-            except BadRequest:
-                logger.exception(
-                    "Failed to send media group to chat {}; sending individually",
-                    chat_id,
-                )
-                await _send_photos_individually(bot, chat_id, existing_photos)
-        finally:
-            for photo_file in open_files:
-                photo_file.close()
-    else:
-        with existing_photos[0].open("rb") as photo_file:
-            photo_file.seek(0)
-            await bot.send_photo(
-                chat_id=chat_id,
-                photo=photo_file,
+            await bot.send_media_group(chat_id=chat_id, media=media_group)
+            logger.debug(
+                "Sent media group with {} photos to chat {}",
+                len(photos),
+                chat_id,
             )
+        except BadRequest:
+            logger.exception(
+                "Failed to send media group to chat {}; sending individually",
+                chat_id,
+            )
+            await _send_photos_individually(bot, chat_id, photos)
+    else:
+        await bot.send_photo(
+            chat_id=chat_id,
+            photo=_photo_buffer(photos[0]),
+        )
         logger.debug("Sent single photo to chat {}", chat_id)
 
 
 async def _send_photos_individually(
     bot: Bot,
     chat_id: int,
-    photos: list[Path],
+    photos: list[_PhotoPayload],
 ) -> None:
-    for photo_path in photos:
-        if not photo_path.exists():
-            logger.warning(
-                "Skipping missing photo {} when sending to chat {}",
-                photo_path,
-                chat_id,
-            )
-            continue
+    for photo in photos:
+        name = photo[0]
         try:
-            with photo_path.open("rb") as photo_file:
-                photo_file.seek(0)
-                await bot.send_photo(
-                    chat_id=chat_id,
-                    photo=photo_file,
-                )
-            logger.debug(
-                "Sent fallback individual photo {} to chat {}", photo_path, chat_id
+            await bot.send_photo(
+                chat_id=chat_id,
+                photo=_photo_buffer(photo),
             )
+            logger.debug("Sent fallback individual photo {} to chat {}", name, chat_id)
         except TelegramError:
             logger.exception(
-                "Failed to send individual photo {} to chat {}", photo_path, chat_id
+                "Failed to send individual photo {} to chat {}", name, chat_id
             )
 
 
@@ -471,7 +512,7 @@ def _persist_application(
 
     session_key = user_data.get("session_key")
     session_dir: Path | None = user_data.get("session_dir")
-    photos = [str(photo_path) for photo_path in user_data.get("photos", [])]
+    photos: list[str] = user_data.get("photos", [])
 
     record = {
         "session_key": session_key or uuid4().hex,
@@ -501,9 +542,11 @@ def _persist_application(
     user_applications_key = f"{prefix}:user:{user.id}:applications"
 
     try:
-        valkey_client.hset(valkey_key, mapping=record)
-        valkey_client.sadd(user_applications_key, valkey_key)
-        valkey_client.sadd(f"{prefix}:applications", valkey_key)
+        with valkey_client.pipeline() as pipe:
+            pipe.hset(valkey_key, mapping=record)
+            pipe.sadd(user_applications_key, valkey_key)
+            pipe.sadd(f"{prefix}:applications", valkey_key)
+            pipe.execute()
         record_active_user(context, user.id)
         logger.info(
             "Persisted submission for user {} under key {}",
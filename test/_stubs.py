@@ -0,0 +1,264 @@
+"""Lightweight stand-ins for the external packages the bot imports."""
+
+from __future__ import annotations
+
+import enum
+import io
+import sys
+import types
+from bisect import bisect_left, insort
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+
+_STUBBED_MODULES = (
+    "telegram",
+    "telegram.error",
+    "telegram.constants",
+    "telegram.ext",
+    "valkey",
+    "valkey.exceptions",
+    "minio",
+    "minio.error",
+)
+
+
+class _InlineKeyboardButton:
+    __slots__ = ("text", "callback_data")
+
+    def __init__(self, text: str | None = None, callback_data: str | None = None):
+        self.text = text
+        self.callback_data = callback_data
+
+
+class _InlineKeyboardMarkup:
+    __slots__ = ("inline_keyboard",)
+
+    def __init__(self, inline_keyboard: list[list[object]] | None = None):
+        self.inline_keyboard = inline_keyboard or []
+
+
+class _InputMediaPhoto:
+    __slots__ = ("media", "caption", "parse_mode", "extra")
+
+    def __init__(
+        self,
+        media: object | None = None,
+        *,
+        caption: str | None = None,
+        parse_mode: str | None = None,
+        **kwargs,
+    ):
+        self.media = media
+        self.caption = caption
+        self.parse_mode = parse_mode
+        self.extra = kwargs
+
+
+_BadRequest = type("BadRequest", (Exception,), {})
+_TelegramError = type("TelegramError", (Exception,), {})
+_ChatType = enum.Enum("ChatType", {"PRIVATE": "private", "GROUP": "group"})
+
+
+class _ApplicationBuilder:
+    __slots__ = ()
+
+    def token(self, _token: str) -> "_ApplicationBuilder":
+        return self
+
+    def build(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            bot_data={},
+            add_handler=lambda *args, **kwargs: None,
+            add_error_handler=lambda *args, **kwargs: None,
+            run_polling=lambda: None,
+        )
+
+
+class _ConversationHandler:
+    __slots__ = ()
+    END = object()
+
+    def __init__(self, *args, **kwargs) -> None:  # noqa: D401 - dummy init
+        """Placeholder initializer."""
+
+
+class _DummyHandler:
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs) -> None:  # noqa: D401 - dummy init
+        """Placeholder initializer."""
+
+
+class _Filters:
+    __slots__ = ("TEXT", "COMMAND", "PHOTO")
+
+    def __init__(self) -> None:
+        self.TEXT = self
+        self.COMMAND = self
+        self.PHOTO = self
+
+    def __and__(self, _other: object) -> "_Filters":
+        return self
+
+    def __or__(self, _other: object) -> "_Filters":
+        return self
+
+    def __invert__(self) -> "_Filters":
+        return self
+
+    def Regex(self, _pattern: str) -> "_Filters":
+        return self
+
+
+_FILTERS = _Filters()
+
+
+_EMPTY_HASH: MappingProxyType[str, str] = MappingProxyType({})
+
+
+def _noop(*args, **kwargs) -> None:
+    return None
+
+
+class _DummyValkey:
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    ping = hset = sadd = delete = staticmethod(_noop)
+    hgetall = staticmethod(lambda *args, **kwargs: _EMPTY_HASH)
+    # Read-only snapshot, matching InMemoryValkey.smembers; callers only
+    # iterate or test membership, so the shared empty frozenset is safe.
+    smembers = staticmethod(lambda *args, **kwargs: frozenset())
+
+
+_ValkeyError = type("ValkeyError", (Exception,), {})
+_ValkeyConnectionError = type("ConnectionError", (_ValkeyError,), {})
+_ValkeyTimeoutError = type("TimeoutError", (_ValkeyError,), {})
+_ValkeyResponseError = type("ResponseError", (_ValkeyError,), {})
+
+
+_S3Error = type("S3Error", (Exception,), {})
+
+
+class _DummyObject:
+    __slots__ = ("object_name",)
+
+    def __init__(self, name: str) -> None:
+        self.object_name = name
+
+
+class _DummyMinio:
+    def __init__(self, *args, **kwargs) -> None:
+        self._storage: dict[tuple[str, str], bytes] = {}
+        self._buckets: set[str] = set()
+        self._names: dict[str, list[str]] = {}
+
+    def bucket_exists(self, bucket: str) -> bool:
+        return bucket in self._buckets
+
+    def make_bucket(self, bucket: str) -> None:
+        self._buckets.add(bucket)
+
+    def fput_object(self, bucket: str, object_name: str, file_path: str) -> None:
+        self._buckets.add(bucket)
+        key = (bucket, object_name)
+        if key not in self._storage:
+            insort(self._names.setdefault(bucket, []), object_name)
+        self._storage[key] = Path(file_path).read_bytes()
+
+    def fget_object(self, bucket: str, object_name: str, file_path: str) -> None:
+        data = self._storage.get((bucket, object_name))
+        if data is None:
+            raise _S3Error("missing")
+        target = Path(file_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+
+    def list_objects(self, bucket: str, prefix: str = "", recursive: bool = False):
+        names = self._names.get(bucket, [])
+        matches: list[str] = []
+        for name in names[bisect_left(names, prefix) :]:
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+        for name in matches:
+            yield _DummyObject(name)
+
+    def get_object(self, bucket: str, object_name: str):
+        data = self._storage.get((bucket, object_name))
+        if data is None:
+            raise _S3Error("missing")
+        return io.BytesIO(data)
+
+
+def install_stubs() -> list[str]:
+    """Register stub modules for every external package not already imported.
+
+    Returns the names that were added to :data:`sys.modules` so the caller can
+    remove them again at the end of the session.
+    """
+
+    installed: list[str] = []
+    if all(name in sys.modules for name in _STUBBED_MODULES):
+        return installed
+
+    if "telegram" not in sys.modules:
+        # Bot and Update are only referenced in annotations, so any placeholder
+        # object will do.
+        _register(
+            installed,
+            "telegram",
+            Bot=SimpleNamespace,
+            Update=SimpleNamespace,
+            InlineKeyboardButton=_InlineKeyboardButton,
+            InlineKeyboardMarkup=_InlineKeyboardMarkup,
+            InputMediaPhoto=_InputMediaPhoto,
+        )
+        _register(
+            installed,
+            "telegram.error",
+            BadRequest=_BadRequest,
+            TelegramError=_TelegramError,
+        )
+        _register(installed, "telegram.constants", ChatType=_ChatType)
+
+    if "telegram.ext" not in sys.modules:
+        _register(
+            installed,
+            "telegram.ext",
+            ApplicationBuilder=_ApplicationBuilder,
+            CommandHandler=_DummyHandler,
+            MessageHandler=_DummyHandler,
+            CallbackQueryHandler=_DummyHandler,
+            ConversationHandler=_ConversationHandler,
+            ContextTypes=SimpleNamespace(DEFAULT_TYPE=object()),
+            filters=_FILTERS,
+        )
+
+    if "valkey" not in sys.modules:
+        _register(installed, "valkey", Valkey=_DummyValkey)
+
+    if "minio" not in sys.modules:
+        _register(installed, "minio", Minio=_DummyMinio)
+        _register(installed, "minio.error", S3Error=_S3Error)
+
+    if "valkey.exceptions" not in sys.modules:
+        _register(
+            installed,
+            "valkey.exceptions",
+            ValkeyError=_ValkeyError,
+            ConnectionError=_ValkeyConnectionError,
+            TimeoutError=_ValkeyTimeoutError,
+            ResponseError=_ValkeyResponseError,
+        )
+
+    return installed
+
+
+def _register(installed: list[str], name: str, **attributes: object) -> None:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    installed.append(name)
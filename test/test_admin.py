@@ -1,25 +1,24 @@
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
+import pytest
 
-def _make_context(
-    client: object,
-    *,
-    prefix: str = "test",
-    super_admins: list[int] | None = None,
-) -> SimpleNamespace:
-    bot_data = {"valkey_client": client, "valkey_prefix": prefix}
-    if super_admins is not None:
-        bot_data["super_admin_ids"] = super_admins
-    return SimpleNamespace(application=SimpleNamespace(bot_data=bot_data))
+from .utils import DummyMessage, seed
 
+_NOW = datetime.now(timezone.utc)
+_RECENT_ISO = (_NOW - timedelta(days=2)).isoformat()
+_STALE_ISO = (_NOW - timedelta(days=45)).isoformat()
 
-def test_add_and_remove_admin_roundtrip(bot_modules) -> None:
-    client = bot_modules.storage.InMemoryValkey()
-    context = _make_context(client, super_admins=[999])
+
+@pytest.fixture
+def dummy_message() -> DummyMessage:
+    return DummyMessage()
+
+
+def test_add_and_remove_admin_roundtrip(bot_modules, valkey_context) -> None:
+    _, context = valkey_context(super_admins=[999])
 
     assert bot_modules.admin.add_admin(context, 123)
     assert 123 in bot_modules.admin.get_admins(context)
@@ -29,30 +28,24 @@ def test_add_and_remove_admin_roundtrip(bot_modules) -> None:
     assert 123 not in bot_modules.admin.get_admins(context)
 
 
-def test_recipients_for_audience_filters_recent(bot_modules) -> None:
-    client = bot_modules.storage.InMemoryValkey()
+def test_recipients_for_audience_filters_recent(bot_modules, valkey_context) -> None:
     prefix = "testbot"
-    context = _make_context(client, prefix=prefix)
-
-    now = datetime.now(timezone.utc)
-    recent = now - timedelta(days=2)
-    stale = now - timedelta(days=45)
+    client, context = valkey_context(prefix=prefix)
 
     recent_key = f"{prefix}:submission:recent"
     stale_key = f"{prefix}:submission:stale"
 
-    client.hset(
-        recent_key,
-        mapping={"user_id": "1", "created_at": recent.isoformat()},
-    )
-    client.hset(
-        stale_key,
-        mapping={"user_id": "2", "created_at": stale.isoformat()},
+    seed(
+        client,
+        hashes={
+            recent_key: {"user_id": "1", "created_at": _RECENT_ISO},
+            stale_key: {"user_id": "2", "created_at": _STALE_ISO},
+        },
+        sets={
+            f"{prefix}:applications": [recent_key, stale_key],
+            f"{prefix}:users": ["1", "2"],
+        },
     )
-    client.sadd(f"{prefix}:applications", recent_key)
-    client.sadd(f"{prefix}:applications", stale_key)
-    client.sadd(f"{prefix}:users", "1")
-    client.sadd(f"{prefix}:users", "2")
 
     all_recipients = bot_modules.admin.recipients_for_audience(context, "all")
     assert all_recipients == {1, 2}
@@ -61,58 +54,40 @@ def test_recipients_for_audience_filters_recent(bot_modules) -> None:
     assert recent_recipients == {1}
 
 
-def test_mark_application_revoked_success(bot_modules) -> None:
-    client = bot_modules.storage.InMemoryValkey()
-    prefix = "testbot"
-    context = _make_context(client, prefix=prefix)
-    session_key = "session123"
-    key = f"{prefix}:{session_key}"
-
-    client.hset(
-        key,
-        mapping={
-            "session_key": session_key,
-            "user_id": "42",
-            "position": "Test",
-        },
-    )
-    client.sadd(f"{prefix}:applications", key)
-
-    result = bot_modules.admin.mark_application_revoked(context, session_key, 42)
-    assert result is True
-
-    record = client.hgetall(key)
-    assert record.get("revoked_by") == "42"
-    assert record.get("revoked_at")
-
-
-def test_mark_application_revoked_requires_owner(bot_modules) -> None:
-    client = bot_modules.storage.InMemoryValkey()
+@pytest.mark.parametrize(
+    ("owner_id", "expected_result", "expected_by"),
+    [("42", True, "42"), ("7", False, None)],
+    ids=["owner", "not-owner"],
+)
+def test_mark_application_revoked(
+    bot_modules,
+    valkey_context,
+    owner_id: str,
+    expected_result: bool,
+    expected_by: str | None,
+) -> None:
     prefix = "testbot"
-    context = _make_context(client, prefix=prefix)
+    client, context = valkey_context(prefix=prefix)
     session_key = "session123"
     key = f"{prefix}:{session_key}"
 
-    client.hset(
-        key,
-        mapping={
-            "session_key": session_key,
-            "user_id": "7",
-        },
+    seed(
+        client,
+        hashes={key: {"session_key": session_key, "user_id": owner_id}},
+        sets={f"{prefix}:applications": [key]},
     )
-    client.sadd(f"{prefix}:applications", key)
 
     result = bot_modules.admin.mark_application_revoked(context, session_key, 42)
-    assert result is False
+    assert result is expected_result
 
     record = client.hgetall(key)
-    assert "revoked_at" not in record
+    assert record.get("revoked_by") == expected_by
+    assert ("revoked_at" in record) is expected_result
 
 
-def test_mark_application_reviewed_sets_fields(bot_modules) -> None:
-    client = bot_modules.storage.InMemoryValkey()
+def test_mark_application_reviewed_sets_fields(bot_modules, valkey_context) -> None:
     prefix = "testbot"
-    context = _make_context(client, prefix=prefix)
+    client, context = valkey_context(prefix=prefix)
     session_key = "session-review"
     key = f"{prefix}:{session_key}"
 
@@ -129,10 +104,9 @@ def test_mark_application_reviewed_sets_fields(bot_modules) -> None:
     assert record.get("reviewed_at") == timestamp
 
 
-def test_clear_application_review_resets_fields(bot_modules) -> None:
-    client = bot_modules.storage.InMemoryValkey()
+def test_clear_application_review_resets_fields(bot_modules, valkey_context) -> None:
     prefix = "testbot"
-    context = _make_context(client, prefix=prefix)
+    client, context = valkey_context(prefix=prefix)
     session_key = "session-review"
     key = f"{prefix}:{session_key}"
 
@@ -152,37 +126,21 @@ def test_clear_application_review_resets_fields(bot_modules) -> None:
     assert "reviewed_by" not in record
 
 
-def test_show_admin_roster_lists_assignments(bot_modules) -> None:
+async def test_show_admin_roster_lists_assignments(
+    bot_modules, valkey_context, dummy_message
+) -> None:
     admin_commands = bot_modules.admin_commands
-    storage = bot_modules.storage
 
-    client = storage.InMemoryValkey()
     prefix = "testbot"
-    bot_data = {
-        "valkey_client": client,
-        "valkey_prefix": prefix,
-        "super_admin_ids": [101, 202],
-    }
-    context = SimpleNamespace(application=SimpleNamespace(bot_data=bot_data))
-
-    client.sadd(f"{prefix}:admins", "303")
-    client.sadd(f"{prefix}:admins", "404")
-    client.sadd(f"{prefix}:admins", "101")  # ensure duplicates are ignored
-
-    class DummyMessage:
-        def __init__(self) -> None:
-            self.replies: list[tuple[str, str | None]] = []
+    client, context = valkey_context(prefix=prefix, super_admins=[101, 202])
 
-        async def reply_text(self, text: str, parse_mode: str | None = None) -> None:
-            self.replies.append((text, parse_mode))
+    # 101 is also a super admin; the duplicate must be ignored.
+    seed(client, sets={f"{prefix}:admins": ["303", "404", "101"]})
 
-    message = DummyMessage()
+    message = dummy_message
     update = SimpleNamespace(message=message, effective_user=SimpleNamespace(id=101))
 
-    async def invoke() -> None:
-        await admin_commands.show_admin_roster(update, context)
-
-    asyncio.run(invoke())
+    await admin_commands.show_admin_roster(update, context)
 
     assert len(message.replies) == 1
     text, parse_mode = message.replies[0]
@@ -194,32 +152,19 @@ def test_show_admin_roster_lists_assignments(bot_modules) -> None:
     assert "101" not in admin_section
 
 
-def test_show_admin_roster_requires_super_admin(bot_modules) -> None:
+async def test_show_admin_roster_requires_super_admin(
+    bot_modules, valkey_context, dummy_message
+) -> None:
     admin_commands = bot_modules.admin_commands
-    storage = bot_modules.storage
 
-    client = storage.InMemoryValkey()
     prefix = "testbot"
-    bot_data = {
-        "valkey_client": client,
-        "valkey_prefix": prefix,
-        "super_admin_ids": [1],
-    }
-    context = SimpleNamespace(application=SimpleNamespace(bot_data=bot_data))
-
-    class DummyMessage:
-        def __init__(self) -> None:
-            self.replies: list[str] = []
+    _, context = valkey_context(prefix=prefix, super_admins=[1])
 
-        async def reply_text(self, text: str, parse_mode: str | None = None) -> None:
-            self.replies.append(text)
-
-    message = DummyMessage()
+    message = dummy_message
     update = SimpleNamespace(message=message, effective_user=SimpleNamespace(id=999))
 
-    async def invoke() -> None:
-        await admin_commands.show_admin_roster(update, context)
-
-    asyncio.run(invoke())
+    await admin_commands.show_admin_roster(update, context)
 
-    assert message.replies == [admin_commands.get_message("admin.super_admin_required")]
+    assert [text for text, _ in message.replies] == [
+        admin_commands.get_message("admin.super_admin_required")
+    ]
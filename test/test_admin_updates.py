@@ -1,31 +1,16 @@
-import types
+from .utils import seed
 
 
-def _build_context(client, prefix="testbot"):
-    return types.SimpleNamespace(
-        application=types.SimpleNamespace(
-            bot_data={"valkey_client": client, "valkey_prefix": prefix}
-        )
-    )
-
-
-def test_update_application_fields_success(tmp_path, bot_modules):
+def test_update_application_fields_success(tmp_path, bot_modules, valkey_context):
     admin = bot_modules.admin
-    storage = bot_modules.storage
-
-    client = storage.InMemoryValkey()
-    context = _build_context(client)
+    client, context = valkey_context()
     session_key = "session-1"
     valkey_key = f"testbot:{session_key}"
-    client.hset(
-        valkey_key,
-        mapping={
-            "user_id": "42",
-            "position": "Old",
-            "photos": "",
-        },
+    seed(
+        client,
+        hashes={valkey_key: {"user_id": "42", "position": "Old", "photos": ""}},
+        sets={"testbot:applications": [valkey_key]},
     )
-    client.sadd("testbot:applications", valkey_key)
 
     photo_dir = tmp_path / "media"
     photo_dir.mkdir()
@@ -46,22 +31,16 @@ def test_update_application_fields_success(tmp_path, bot_modules):
     assert record["photos"] == f"{first_photo},{second_photo}"
 
 
-def test_update_application_fields_rejects_other_user(bot_modules):
+def test_update_application_fields_rejects_other_user(bot_modules, valkey_context):
     admin = bot_modules.admin
-    storage = bot_modules.storage
-
-    client = storage.InMemoryValkey()
-    context = _build_context(client)
+    client, context = valkey_context()
     session_key = "session-2"
     valkey_key = f"testbot:{session_key}"
-    client.hset(
-        valkey_key,
-        mapping={
-            "user_id": "99",
-            "position": "Original",
-        },
+    seed(
+        client,
+        hashes={valkey_key: {"user_id": "99", "position": "Original"}},
+        sets={"testbot:applications": [valkey_key]},
     )
-    client.sadd("testbot:applications", valkey_key)
 
     result = admin.update_application_fields(
         context,
@@ -2,13 +2,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from .utils import capture_logs, extract_messages
+import pytest
 
+from .utils import capture_logs
 
-def test_load_config_logs_and_parses(tmp_path: Path, bot_modules) -> None:
-    config_path = tmp_path / "config.ini"
-    config_path.write_text(
-        """
+_SAMPLE_CONFIG = """
 [telegram]
 token = 123456:ABC
 moderator_chat_ids = 123,456
@@ -19,11 +17,24 @@ valkey_port = 6379
 valkey_pass = secret
 valkey_prefix = demo_prefix
 """.strip()
-    )
 
-    with capture_logs(bot_modules.logging.logger, level="INFO") as events:
+
+@pytest.fixture(scope="module")
+def loaded_sample_config(tmp_path_factory, bot_modules):
+    """Write and parse the sample INI once, keeping the config and log lines."""
+
+    config_path = tmp_path_factory.mktemp("cfg") / "config.ini"
+    config_path.write_text(_SAMPLE_CONFIG)
+
+    with capture_logs(bot_modules.logging.logger, level="INFO") as captured:
         config = bot_modules.config.load_config(config_path)
 
+    return config, "\n".join(captured)
+
+
+def test_load_config_logs_and_parses(loaded_sample_config) -> None:
+    config, messages = loaded_sample_config
+
     assert config["token"] == "123456:ABC"
     assert config["moderator_chat_ids"] == [123, 456]
     assert config["valkey"]["host"] == "localhost"
@@ -36,12 +47,9 @@ valkey_prefix = demo_prefix
     assert Path(storage["local_root"]).name == "media"
     assert Path(storage["cache_dir"]).name == "media"
 
-    messages = extract_messages(events)
-    assert any(
-        "Configuration loaded for 2 moderators" in message for message in messages
-    )
-    assert any("Valkey host localhost:6379" in message for message in messages)
-    assert any("Media storage backend configured" in message for message in messages)
+    assert "Configuration loaded for 2 moderators" in messages
+    assert "Valkey host localhost:6379" in messages
+    assert "Media storage backend configured" in messages
 
 
 def test_create_valkey_client_success(monkeypatch, bot_modules) -> None:
@@ -1,114 +1,99 @@
-import asyncio
 from pathlib import Path
 from types import SimpleNamespace
+from typing import NamedTuple
+from unittest.mock import AsyncMock, call
 
+import pytest
 
-class DummyBot:
-    def __init__(self, file_dir: Path) -> None:
-        self.file_dir = file_dir
-        self.edited_messages: list[tuple[int, int, str]] = []
-        self.sent_photos: list[tuple[int, Path]] = []
-        self.file_requests: list[str] = []
+from .utils import (
+    FakeApplication,
+    FakeContext,
+    expected_message,
+    make_minio_storage,
+)
 
-    async def edit_message_text(
-        self, chat_id: int, message_id: int, text: str, reply_markup=None
-    ) -> None:
-        self.edited_messages.append((chat_id, message_id, text))
+_NEW_POSITION = "Новая позиция"
+_NEW_DESCRIPTION = "Новое описание"
 
-    async def send_photo(self, chat_id: int, photo) -> None:  # pragma: no cover - IO
-        path = Path(getattr(photo, "name", "photo"))
-        self.sent_photos.append((chat_id, path))
 
-    async def send_media_group(
-        self, chat_id: int, media: list
-    ) -> None:  # pragma: no cover
-        self.sent_photos.append((chat_id, Path("group")))
+class _TelegramFile:
+    def __init__(self, directory: Path, identifier: str) -> None:
+        self.file_path = str(directory / f"{identifier}.jpg")
 
-    async def get_file(self, file_id: str):  # pragma: no cover - network
-        self.file_requests.append(file_id)
+    async def download_to_drive(self, custom_path: str) -> None:
+        Path(custom_path).write_bytes(b"data")
 
-        class _TelegramFile:
-            def __init__(self, directory: Path, identifier: str) -> None:
-                self.directory = directory
-                self.identifier = identifier
-                self.file_path = str(directory / f"{identifier}.jpg")
 
-            async def download_to_drive(self, custom_path: str) -> None:
-                Path(custom_path).write_bytes(b"data")
+def _make_bot(file_dir: Path) -> SimpleNamespace:
+    return SimpleNamespace(
+        edit_message_text=AsyncMock(),
+        send_photo=AsyncMock(),
+        send_media_group=AsyncMock(),
+        get_file=AsyncMock(
+            side_effect=lambda file_id: _TelegramFile(file_dir, file_id)
+        ),
+    )
+
+
+def _make_message(chat_id: int, message_id: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(
+        chat_id=chat_id,
+        message_id=message_id,
+        chat=SimpleNamespace(id=chat_id),
+        reply_text=AsyncMock(),
+    )
 
-        return _TelegramFile(self.file_dir, file_id)
 
+def _make_query(data: str, user_id: int, message: SimpleNamespace) -> SimpleNamespace:
+    return SimpleNamespace(
+        data=data,
+        from_user=SimpleNamespace(id=user_id),
+        message=message,
+        answer=AsyncMock(),
+        edit_message_text=AsyncMock(),
+    )
 
-class DummyMessage:
-    def __init__(self, chat_id: int, message_id: int = 1) -> None:
-        self.chat_id = chat_id
-        self.message_id = message_id
-        self.chat = SimpleNamespace(id=chat_id)
-        self.replies: list[tuple[str, object | None]] = []
 
-    async def reply_text(self, text: str, reply_markup=None) -> None:
-        self.replies.append((text, reply_markup))
+def _make_user_message(text: str = "") -> SimpleNamespace:
+    return SimpleNamespace(text=text, photo=[], reply_text=AsyncMock())
 
 
-class DummyCallbackQuery:
-    def __init__(self, data: str, user_id: int, message: DummyMessage) -> None:
-        self.data = data
-        self.from_user = SimpleNamespace(id=user_id)
-        self.message = message
-        self.answers: list[tuple[str | None, bool]] = []
-        self.edits: list[tuple[str, object | None]] = []
+def _texts(method: AsyncMock) -> list[tuple[str, object | None]]:
+    """Return ``(text, reply_markup)`` for each await of ``method``."""
 
-    async def answer(self, text: str | None = None, show_alert: bool = False) -> None:
-        self.answers.append((text, show_alert))
+    return [
+        (awaited.args[0], awaited.kwargs.get("reply_markup"))
+        for awaited in method.await_args_list
+    ]
 
-    async def edit_message_text(self, text: str, reply_markup=None) -> None:
-        self.edits.append((text, reply_markup))
 
+def _photos_sent(bot: SimpleNamespace) -> bool:
+    return bool(bot.send_photo.await_count or bot.send_media_group.await_count)
 
-class DummyUserMessage:
-    def __init__(self, text: str = "") -> None:
-        self.text = text
-        self.replies: list[str] = []
-        self.photo: list[SimpleNamespace] = []
 
-    async def reply_text(self, text: str) -> None:
-        self.replies.append(text)
+class PreparedDetail(NamedTuple):
+    bot: SimpleNamespace
+    client: object
+    context: FakeContext
 
 
-def _build_context(bot_modules, bot, storage) -> tuple[object, SimpleNamespace]:
-    client = bot_modules.storage.InMemoryValkey()
+def _build_context(client, bot, storage) -> tuple[object, FakeContext]:
     bot_data = {
         "valkey_client": client,
         "valkey_prefix": "testbot",
         "moderator_chat_ids": [],
         "media_storage": storage,
     }
-    context = SimpleNamespace(
-        application=SimpleNamespace(bot_data=bot_data),
-        bot=bot,
-        user_data={},
-    )
+    context = FakeContext(FakeApplication(bot_data), bot=bot)
     return client, context
 
 
-def _make_local_storage(bot_modules, tmp_path):
-    return bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
-
-
-def _make_minio_storage(bot_modules, tmp_path):
-    client = bot_modules.media_storage.Minio(
-        "minio", access_key=None, secret_key=None, secure=False
-    )
-    storage = bot_modules.media_storage.MinioMediaStorage(
-        client,
-        bucket="test-bucket",
-        cache_dir=tmp_path / "cache",
-    )
-    return client, storage
+def _make_local_storage(bot_modules, media_tmp):
+    return bot_modules.media_storage.LocalMediaStorage(media_tmp / "media")
 
 
-def _create_submission(
-    client,
+def _stage_submission(
+    pipe,
     prefix: str,
     session_key: str,
     user_id: int,
@@ -134,344 +119,315 @@ def _create_submission(
         "session_dir": str(session.directory or ""),
     }
     key = f"{prefix}:{session_key}"
-    client.hset(key, mapping=record)
-    client.sadd(f"{prefix}:applications", key)
+    pipe.hset(key, mapping=record)
+    pipe.sadd(f"{prefix}:applications", key)
     return handle
 
 
-def test_list_applications_renders_grid(tmp_path, bot_modules):
-    async def run() -> None:
-        commands = bot_modules.commands
-        bot = DummyBot(tmp_path)
-        storage = _make_local_storage(bot_modules, tmp_path)
-        client, context = _build_context(bot_modules, bot, storage)
+def _create_submission(
+    client, prefix: str, session_key: str, user_id: int, storage, **options
+) -> str:
+    with client.pipeline() as pipe:
+        handle = _stage_submission(
+            pipe, prefix, session_key, user_id, storage, **options
+        )
+        pipe.execute()
+    return handle
 
-        _create_submission(client, "testbot", "s1", 100, storage)
 
-        message = DummyMessage(chat_id=100)
-        update = SimpleNamespace(
-            message=message,
-            effective_user=SimpleNamespace(id=100),
-        )
+def _create_submissions_bulk(
+    client, prefix: str, count: int, user_id: int, storage
+) -> list[str]:
+    """Create ``count`` submissions ``s1..sN`` and store them in one pipeline."""
 
-        result = await commands.list_applications(update, context)
-        assert result is commands.ConversationHandler.END
+    with client.pipeline() as pipe:
+        handles = [
+            _stage_submission(
+                pipe,
+                prefix,
+                f"s{idx + 1}",
+                user_id,
+                storage,
+                position=f"Item {idx}",
+            )
+            for idx in range(count)
+        ]
+        pipe.execute()
+    return handles
 
-        assert message.replies
-        text_value, markup = message.replies[0]
-        assert text_value == commands.get_message("list.instructions")
-        assert markup is not None
-        assert markup.inline_keyboard
-        assert markup.inline_keyboard[0][0].callback_data.startswith("list:view:")
 
-    asyncio.run(run())
+async def test_list_applications_renders_grid(media_tmp, bot_modules, valkey_client):
+    commands = bot_modules.commands
+    bot = _make_bot(media_tmp)
+    storage = _make_local_storage(bot_modules, media_tmp)
+    client, context = _build_context(valkey_client, bot, storage)
 
+    _create_submission(client, "testbot", "s1", 100, storage)
 
-def test_list_applications_renders_grid_minio(tmp_path, bot_modules):
-    async def run() -> None:
-        commands = bot_modules.commands
-        bot = DummyBot(tmp_path)
-        _minio_client, storage = _make_minio_storage(bot_modules, tmp_path)
-        client, context = _build_context(bot_modules, bot, storage)
+    message = _make_message(chat_id=100)
+    update = SimpleNamespace(
+        message=message,
+        effective_user=SimpleNamespace(id=100),
+    )
 
-        _create_submission(client, "testbot", "s1", 100, storage)
+    result = await commands.list_applications(update, context)
+    assert result is commands.ConversationHandler.END
 
-        message = DummyMessage(chat_id=100)
-        update = SimpleNamespace(
-            message=message,
-            effective_user=SimpleNamespace(id=100),
-        )
+    message.reply_text.assert_awaited()
+    text_value, markup = _texts(message.reply_text)[0]
+    assert text_value == expected_message("list.instructions")
+    assert markup is not None
+    assert markup.inline_keyboard
+    assert markup.inline_keyboard[0][0].callback_data.startswith("list:view:")
 
-        result = await commands.list_applications(update, context)
-        assert result is commands.ConversationHandler.END
-
-        assert message.replies
-        text_value, markup = message.replies[0]
-        assert text_value == commands.get_message("list.instructions")
-        assert markup is not None
-        assert markup.inline_keyboard
-        assert markup.inline_keyboard[0][0].callback_data.startswith("list:view:")
-        assert (tmp_path / "cache" / "s1" / "photo.jpg").exists()
-
-    asyncio.run(run())
-
-
-def test_paginate_list_updates_message(tmp_path, bot_modules):
-    async def run() -> None:
-        commands = bot_modules.commands
-        bot = DummyBot(tmp_path)
-        storage = bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
-        client, context = _build_context(bot_modules, bot, storage)
-
-        for idx in range(2):
-            session = f"s{idx + 1}"
-            _create_submission(
-                client,
-                "testbot",
-                session,
-                100,
-                storage,
-                position=f"Item {idx}",
-            )
 
-        message = DummyMessage(chat_id=100)
-        await commands.list_applications(
-            SimpleNamespace(message=message, effective_user=SimpleNamespace(id=100)),
-            context,
-        )
+async def test_list_applications_renders_grid_minio(
+    media_tmp, bot_modules, valkey_client
+):
+    commands = bot_modules.commands
+    bot = _make_bot(media_tmp)
+    _minio_client, storage = make_minio_storage(bot_modules, media_tmp)
+    client, context = _build_context(valkey_client, bot, storage)
 
-        callback_message = DummyMessage(chat_id=100, message_id=10)
-        query = DummyCallbackQuery("list:page:0:100", 100, callback_message)
-        await commands.paginate_list(SimpleNamespace(callback_query=query), context)
+    _create_submission(client, "testbot", "s1", 100, storage)
 
-        assert query.edits
-        text, markup = query.edits[0]
-        assert text == commands.get_message("list.instructions")
-        assert markup is not None
+    message = _make_message(chat_id=100)
+    update = SimpleNamespace(
+        message=message,
+        effective_user=SimpleNamespace(id=100),
+    )
 
-    asyncio.run(run())
+    result = await commands.list_applications(update, context)
+    assert result is commands.ConversationHandler.END
 
+    message.reply_text.assert_awaited()
+    text_value, markup = _texts(message.reply_text)[0]
+    assert text_value == expected_message("list.instructions")
+    assert markup is not None
+    assert markup.inline_keyboard
+    assert markup.inline_keyboard[0][0].callback_data.startswith("list:view:")
+    assert (media_tmp / "cache" / "s1" / "photo.jpg").exists()
 
-def test_show_application_detail_sends_photos(tmp_path, bot_modules):
-    async def run() -> None:
-        commands = bot_modules.commands
-        bot = DummyBot(tmp_path)
-        storage = bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
-        client, context = _build_context(bot_modules, bot, storage)
 
-        _create_submission(client, "testbot", "session", 100, storage)
+async def test_paginate_list_updates_message(media_tmp, bot_modules, valkey_client):
+    commands = bot_modules.commands
+    bot = _make_bot(media_tmp)
+    storage = bot_modules.media_storage.LocalMediaStorage(media_tmp / "media")
+    client, context = _build_context(valkey_client, bot, storage)
 
-        list_message = DummyMessage(chat_id=100)
-        await commands.list_applications(
-            SimpleNamespace(
-                message=list_message, effective_user=SimpleNamespace(id=100)
-            ),
-            context,
-        )
+    _create_submissions_bulk(client, "testbot", 2, 100, storage)
 
-        callback_message = DummyMessage(chat_id=100, message_id=55)
-        query = DummyCallbackQuery("list:view:session:0:100", 100, callback_message)
-        await commands.show_application_detail(
-            SimpleNamespace(callback_query=query), context
-        )
+    message = _make_message(chat_id=100)
+    await commands.list_applications(
+        SimpleNamespace(message=message, effective_user=SimpleNamespace(id=100)),
+        context,
+    )
 
-        assert query.edits
-        detail_text, markup = query.edits[0]
-        assert "Заявка:" in detail_text
-        assert markup is not None
-        assert any(
-            button.callback_data.startswith("edit:")
-            for row in markup.inline_keyboard
-            for button in row
-        )
-        assert bot.sent_photos
+    callback_message = _make_message(chat_id=100, message_id=10)
+    query = _make_query("list:page:0:100", 100, callback_message)
+    await commands.paginate_list(SimpleNamespace(callback_query=query), context)
 
-    asyncio.run(run())
+    query.edit_message_text.assert_awaited()
+    text, markup = _texts(query.edit_message_text)[0]
+    assert text == expected_message("list.instructions")
+    assert markup is not None
 
 
-async def _prepare_detail_view(tmp_path, bot_modules):
+async def test_show_application_detail_sends_photos(
+    media_tmp, bot_modules, valkey_client
+):
     commands = bot_modules.commands
-    bot = DummyBot(tmp_path)
-    storage = bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
-    client, context = _build_context(bot_modules, bot, storage)
+    bot = _make_bot(media_tmp)
+    storage = bot_modules.media_storage.LocalMediaStorage(media_tmp / "media")
+    client, context = _build_context(valkey_client, bot, storage)
 
     _create_submission(client, "testbot", "session", 100, storage)
 
+    list_message = _make_message(chat_id=100)
     await commands.list_applications(
-        SimpleNamespace(
-            message=DummyMessage(chat_id=100),
-            effective_user=SimpleNamespace(id=100),
-        ),
+        SimpleNamespace(message=list_message, effective_user=SimpleNamespace(id=100)),
         context,
     )
-    detail_query = DummyCallbackQuery(
-        "list:view:session:0:100", 100, DummyMessage(100, 5)
-    )
+
+    callback_message = _make_message(chat_id=100, message_id=55)
+    query = _make_query("list:view:session:0:100", 100, callback_message)
     await commands.show_application_detail(
-        SimpleNamespace(callback_query=detail_query), context
+        SimpleNamespace(callback_query=query), context
     )
-    return commands, bot_modules.editing, bot_modules.constants, bot, client, context
-
-
-def test_edit_position_updates_record(tmp_path, bot_modules):
-    async def run() -> None:
-        (
-            commands,
-            editing,
-            constants,
-            bot,
-            client,
-            context,
-        ) = await _prepare_detail_view(tmp_path, bot_modules)
-
-        start_query = DummyCallbackQuery(
-            "edit:position:session", 100, DummyMessage(100)
-        )
-        state = await editing.start_edit_position(
-            SimpleNamespace(callback_query=start_query), context
-        )
-        assert state == constants.EDIT_POSITION
-        assert start_query.message.replies
-
-        user_message = DummyUserMessage("Новая позиция")
-        result = await editing.receive_position(
-            SimpleNamespace(
-                message=user_message, effective_user=SimpleNamespace(id=100)
-            ),
-            context,
-        )
-        assert result is commands.ConversationHandler.END
-        assert user_message.replies == [commands.get_message("edit.position_saved")]
 
-        record = client.hgetall("testbot:session")
-        assert record["position"] == "Новая позиция"
-        assert bot.edited_messages
+    query.edit_message_text.assert_awaited()
+    detail_text, markup = _texts(query.edit_message_text)[0]
+    assert "Заявка:" in detail_text
+    assert markup is not None
+    assert any(
+        button.callback_data.startswith("edit:")
+        for row in markup.inline_keyboard
+        for button in row
+    )
+    assert _photos_sent(bot)
 
-    asyncio.run(run())
 
+def _seed_detail_state(bot_modules, client, context, storage) -> None:
+    """Store a submission and the list state ``show_application_detail`` leaves.
 
-def test_edit_description_updates_record(tmp_path, bot_modules):
-    async def run() -> None:
-        (
-            commands,
-            editing,
-            constants,
-            bot,
-            client,
-            context,
-        ) = await _prepare_detail_view(tmp_path, bot_modules)
+    The cached submissions are omitted; the editing handlers load them from
+    Valkey on first access.
+    """
 
-        start_query = DummyCallbackQuery(
-            "edit:description:session", 100, DummyMessage(100)
-        )
-        state = await editing.start_edit_description(
-            SimpleNamespace(callback_query=start_query), context
-        )
-        assert state == constants.EDIT_DESCRIPTION
-
-        user_message = DummyUserMessage("Новое описание")
-        result = await editing.receive_description(
-            SimpleNamespace(
-                message=user_message, effective_user=SimpleNamespace(id=100)
-            ),
-            context,
-        )
-        assert result is commands.ConversationHandler.END
-        assert user_message.replies == [commands.get_message("edit.description_saved")]
+    _create_submission(client, "testbot", "session", 100, storage)
+    context.user_data[bot_modules.commands.LIST_STATE_KEY] = {
+        "user_id": 100,
+        "page": 0,
+        "detail_message_id": 5,
+        "chat_id": 100,
+        "current_session_key": "session",
+    }
 
-        record = client.hgetall("testbot:session")
-        assert record["description"] == "Новое описание"
-        assert bot.edited_messages
 
-    asyncio.run(run())
+@pytest.fixture
+def detail_view(media_tmp, bot_modules, valkey_client) -> PreparedDetail:
+    bot = _make_bot(media_tmp)
+    storage = bot_modules.media_storage.LocalMediaStorage(media_tmp / "media")
+    client, context = _build_context(valkey_client, bot, storage)
+    _seed_detail_state(bot_modules, client, context, storage)
+    return PreparedDetail(bot, client, context)
 
 
-def test_edit_condition_updates_record(tmp_path, bot_modules):
-    async def run() -> None:
-        (
-            commands,
-            editing,
-            constants,
-            bot,
-            client,
-            context,
-        ) = await _prepare_detail_view(tmp_path, bot_modules)
+async def test_edit_position_updates_record(detail_view, bot_modules):
+    commands = bot_modules.commands
+    editing = bot_modules.editing
+    constants = bot_modules.constants
+    bot, client, context = detail_view
 
-        start_query = DummyCallbackQuery(
-            "edit:condition:session", 100, DummyMessage(100)
-        )
-        state = await editing.start_edit_condition(
-            SimpleNamespace(callback_query=start_query), context
-        )
-        assert state == constants.EDIT_CONDITION
+    start_query = _make_query("edit:position:session", 100, _make_message(100))
+    state = await editing.start_edit_position(
+        SimpleNamespace(callback_query=start_query), context
+    )
+    assert state == constants.EDIT_POSITION
+    start_query.message.reply_text.assert_awaited()
 
-        choice_query = DummyCallbackQuery(
-            "edit_condition:set:session:new",
-            100,
-            DummyMessage(100, 6),
-        )
-        result = await editing.receive_condition_choice(
-            SimpleNamespace(callback_query=choice_query), context
-        )
-        assert result is commands.ConversationHandler.END
-        assert choice_query.answers[-1] == (None, False)
-
-        record = client.hgetall("testbot:session")
-        assert record["condition"] == commands.get_message("workflow.condition_new")
-        assert bot.edited_messages
-
-    asyncio.run(run())
-
-
-def test_start_edit_photos_prompts_with_skip_keyword(tmp_path, bot_modules):
-    async def run() -> None:
-        (
-            commands,
-            editing,
-            constants,
-            _bot,
-            _client,
-            context,
-        ) = await _prepare_detail_view(tmp_path, bot_modules)
-
-        start_message = DummyMessage(100)
-        start_query = DummyCallbackQuery("edit:photos:session", 100, start_message)
-        state = await editing.start_edit_photos(
-            SimpleNamespace(callback_query=start_query), context
-        )
+    user_message = _make_user_message(_NEW_POSITION)
+    result = await editing.receive_position(
+        SimpleNamespace(message=user_message, effective_user=SimpleNamespace(id=100)),
+        context,
+    )
+    assert result is commands.ConversationHandler.END
+    assert user_message.reply_text.await_args_list == [
+        call(expected_message("edit.position_saved"))
+    ]
 
-        assert state == constants.EDIT_PHOTOS
-        assert start_message.replies
-        text, markup = start_message.replies[0]
-        assert markup is None
-        assert text == commands.get_message(
-            "edit.photos_prompt", keyword=constants.SKIP_KEYWORD
-        )
+    record = client.hgetall("testbot:session")
+    assert record["position"] == _NEW_POSITION
+    bot.edit_message_text.assert_awaited()
 
-    asyncio.run(run())
 
+async def test_edit_description_updates_record(detail_view, bot_modules):
+    commands = bot_modules.commands
+    editing = bot_modules.editing
+    constants = bot_modules.constants
+    bot, client, context = detail_view
 
-def test_edit_photos_replaces_media(tmp_path, bot_modules):
-    async def run() -> None:
-        (
-            commands,
-            editing,
-            constants,
-            bot,
-            client,
-            context,
-        ) = await _prepare_detail_view(tmp_path, bot_modules)
+    start_query = _make_query("edit:description:session", 100, _make_message(100))
+    state = await editing.start_edit_description(
+        SimpleNamespace(callback_query=start_query), context
+    )
+    assert state == constants.EDIT_DESCRIPTION
 
-        start_query = DummyCallbackQuery("edit:photos:session", 100, DummyMessage(100))
-        state = await editing.start_edit_photos(
-            SimpleNamespace(callback_query=start_query), context
-        )
-        assert state == constants.EDIT_PHOTOS
-
-        photo_message = DummyUserMessage()
-        photo_message.photo = [SimpleNamespace(file_id="file-1")]
-        result = await editing.receive_photo_upload(
-            SimpleNamespace(
-                message=photo_message, effective_user=SimpleNamespace(id=100)
-            ),
-            context,
-        )
-        assert result == constants.EDIT_PHOTOS
-        assert bot.file_requests == ["file-1"]
-
-        skip_message = DummyUserMessage(bot_modules.constants.SKIP_KEYWORD)
-        result = await editing.finalize_photo_upload(
-            SimpleNamespace(
-                message=skip_message, effective_user=SimpleNamespace(id=100)
-            ),
-            context,
-        )
-        assert result is commands.ConversationHandler.END
-        assert skip_message.replies == [commands.get_message("edit.photos_saved")]
+    user_message = _make_user_message(_NEW_DESCRIPTION)
+    result = await editing.receive_description(
+        SimpleNamespace(message=user_message, effective_user=SimpleNamespace(id=100)),
+        context,
+    )
+    assert result is commands.ConversationHandler.END
+    assert user_message.reply_text.await_args_list == [
+        call(expected_message("edit.description_saved"))
+    ]
+
+    record = client.hgetall("testbot:session")
+    assert record["description"] == _NEW_DESCRIPTION
+    bot.edit_message_text.assert_awaited()
 
-        record = client.hgetall("testbot:session")
-        assert "update_01" in record["photos"]
-        assert bot.edited_messages
-        assert bot.sent_photos
 
-    asyncio.run(run())
+async def test_edit_condition_updates_record(detail_view, bot_modules):
+    commands = bot_modules.commands
+    editing = bot_modules.editing
+    constants = bot_modules.constants
+    bot, client, context = detail_view
+
+    start_query = _make_query("edit:condition:session", 100, _make_message(100))
+    state = await editing.start_edit_condition(
+        SimpleNamespace(callback_query=start_query), context
+    )
+    assert state == constants.EDIT_CONDITION
+
+    choice_query = _make_query(
+        "edit_condition:set:session:new",
+        100,
+        _make_message(100, 6),
+    )
+    result = await editing.receive_condition_choice(
+        SimpleNamespace(callback_query=choice_query), context
+    )
+    assert result is commands.ConversationHandler.END
+    assert choice_query.answer.await_args == call()
+
+    record = client.hgetall("testbot:session")
+    assert record["condition"] == expected_message("workflow.condition_new")
+    bot.edit_message_text.assert_awaited()
+
+
+async def test_start_edit_photos_prompts_with_skip_keyword(detail_view, bot_modules):
+    editing = bot_modules.editing
+    constants = bot_modules.constants
+    _bot, _client, context = detail_view
+
+    start_message = _make_message(100)
+    start_query = _make_query("edit:photos:session", 100, start_message)
+    state = await editing.start_edit_photos(
+        SimpleNamespace(callback_query=start_query), context
+    )
+
+    assert state == constants.EDIT_PHOTOS
+    start_message.reply_text.assert_awaited()
+    text, markup = _texts(start_message.reply_text)[0]
+    assert markup is None
+    assert text == expected_message(
+        "edit.photos_prompt", keyword=constants.SKIP_KEYWORD
+    )
+
+
+async def test_edit_photos_replaces_media(detail_view, bot_modules):
+    commands = bot_modules.commands
+    editing = bot_modules.editing
+    constants = bot_modules.constants
+    bot, client, context = detail_view
+
+    start_query = _make_query("edit:photos:session", 100, _make_message(100))
+    state = await editing.start_edit_photos(
+        SimpleNamespace(callback_query=start_query), context
+    )
+    assert state == constants.EDIT_PHOTOS
+
+    photo_message = _make_user_message()
+    photo_message.photo = [SimpleNamespace(file_id="file-1")]
+    result = await editing.receive_photo_upload(
+        SimpleNamespace(message=photo_message, effective_user=SimpleNamespace(id=100)),
+        context,
+    )
+    assert result == constants.EDIT_PHOTOS
+    bot.get_file.assert_awaited_once_with("file-1")
+
+    skip_message = _make_user_message(bot_modules.constants.SKIP_KEYWORD)
+    result = await editing.finalize_photo_upload(
+        SimpleNamespace(message=skip_message, effective_user=SimpleNamespace(id=100)),
+        context,
+    )
+    assert result is commands.ConversationHandler.END
+    assert skip_message.reply_text.await_args_list == [
+        call(expected_message("edit.photos_saved"))
+    ]
+
+    record = client.hgetall("testbot:session")
+    assert "update_01" in record["photos"]
+    bot.edit_message_text.assert_awaited()
+    assert _photos_sent(bot)
@@ -4,21 +4,11 @@ from pathlib import Path
 
 import pytest
 
-
-def _make_minio_storage(bot_modules, tmp_path: Path):
-    client = bot_modules.media_storage.Minio(
-        "minio", access_key=None, secret_key=None, secure=False
-    )
-    storage = bot_modules.media_storage.MinioMediaStorage(
-        client,
-        bucket="secure-bucket",
-        cache_dir=tmp_path / "cache",
-    )
-    return client, storage
+from .utils import make_minio_storage
 
 
-def test_local_allocate_path_sanitizes_filename(tmp_path: Path, bot_modules) -> None:
-    storage = bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
+def test_local_allocate_path_sanitizes_filename(media_tmp: Path, bot_modules) -> None:
+    storage = bot_modules.media_storage.LocalMediaStorage(media_tmp / "media")
     session = storage.create_session(123)
 
     path = storage.allocate_path(session, "../evil.jpg")
@@ -27,8 +17,8 @@ def test_local_allocate_path_sanitizes_filename(tmp_path: Path, bot_modules) ->
     assert path.name == "evil.jpg"
 
 
-def test_local_storage_rejects_traversal(tmp_path: Path, bot_modules) -> None:
-    storage = bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
+def test_local_storage_rejects_traversal(media_tmp: Path, bot_modules) -> None:
+    storage = bot_modules.media_storage.LocalMediaStorage(media_tmp / "media")
     session = storage.create_session(321)
 
     photo_path = storage.allocate_path(session, "photo.jpg")
@@ -37,7 +27,7 @@ def test_local_storage_rejects_traversal(tmp_path: Path, bot_modules) -> None:
 
     cached = storage.cache_photo(handle)
     assert cached.exists()
-    assert cached.is_relative_to((tmp_path / "media").resolve())
+    assert cached.is_relative_to((media_tmp / "media").resolve())
 
     with pytest.raises(FileNotFoundError):
         storage.cache_photo("../outside.jpg")
@@ -46,8 +36,10 @@ def test_local_storage_rejects_traversal(tmp_path: Path, bot_modules) -> None:
         storage.get_session("../escape")
 
 
-def test_minio_storage_rejects_traversal(tmp_path: Path, bot_modules) -> None:
-    _client, storage = _make_minio_storage(bot_modules, tmp_path)
+def test_minio_storage_rejects_traversal(media_tmp: Path, bot_modules) -> None:
+    _client, storage = make_minio_storage(
+        bot_modules, media_tmp, bucket="secure-bucket"
+    )
     session = storage.create_session(111)
 
     photo_path = storage.allocate_path(session, "photo.jpg")
@@ -56,7 +48,23 @@ def test_minio_storage_rejects_traversal(tmp_path: Path, bot_modules) -> None:
 
     cached = storage.cache_photo(handle)
     assert cached.exists()
-    assert cached.is_relative_to((tmp_path / "cache").resolve())
+    assert cached.is_relative_to((media_tmp / "cache").resolve())
 
     with pytest.raises(FileNotFoundError):
         storage.cache_photo("../escape.jpg")
+
+
+@pytest.mark.parametrize(
+    ("file_path", "expected"),
+    [
+        ("photos/file_1.png", ".png"),
+        ("photos/file_1", ".jpg"),
+        ("photos.v2/file_1", ".jpg"),
+        ("photos/.hidden", ".jpg"),
+        (None, ".jpg"),
+    ],
+)
+def test_photo_suffix_matches_path_suffix(
+    bot_modules, file_path: str | None, expected: str
+) -> None:
+    assert bot_modules.media_storage.photo_suffix(file_path) == expected
@@ -1,27 +1,25 @@
 from __future__ import annotations
 
 from pathlib import Path
-from types import SimpleNamespace
 
 import pytest
 
-from .utils import capture_logs, extract_messages
+from .utils import FakeApplication, FakeContext, capture_logs
 
 
-def test_application_store_emits_logging(tmp_path: Path, bot_modules) -> None:
-    store = bot_modules.storage.ApplicationStore(
-        bot_modules.storage.InMemoryValkey(), prefix="test"
-    )
-    photo_path = tmp_path / "example.jpg"
-    photo_path.write_text("content", encoding="utf-8")
+def test_application_store_emits_logging(
+    media_tmp: Path, bot_modules, valkey_client
+) -> None:
+    store = bot_modules.storage.ApplicationStore(valkey_client, prefix="test")
+    photo_path = media_tmp / "example.jpg"
 
     initial_data = {
         "session_key": "session-1",
-        "session_dir": tmp_path,
+        "session_dir": media_tmp,
         "photos": [],
     }
 
-    with capture_logs(bot_modules.logging.logger, level="DEBUG") as events:
+    with capture_logs(bot_modules.logging.logger, level="DEBUG") as captured:
         store.init_session(42, initial_data)
         store.set_fields(42, position="Chair")
         photos = store.append_photo(42, photo_path)
@@ -31,33 +29,69 @@ def test_application_store_emits_logging(tmp_path: Path, bot_modules) -> None:
         assert session["photos"][0] == str(photo_path)
         store.clear(42)
 
-    messages = extract_messages(events)
-    assert any("Initialized session" in message for message in messages)
-    assert any("Updated session" in message for message in messages)
-    assert any("Appended photo" in message for message in messages)
-    assert any("Loaded session" in message for message in messages)
-    assert any("Cleared session" in message for message in messages)
+    messages = "\n".join(captured)
+    assert "Initialized session" in messages
+    assert "Updated session" in messages
+    assert "Appended photo" in messages
+    assert "Loaded session" in messages
+    assert "Cleared session" in messages
 
     assert store.get(42) == {}
 
 
 def test_get_application_store_requires_client(bot_modules) -> None:
-    context = SimpleNamespace(application=SimpleNamespace(bot_data={}))
+    context = FakeContext(FakeApplication())
 
     with pytest.raises(RuntimeError):
         bot_modules.storage.get_application_store(context)
 
 
-def test_get_application_store_uses_configured_prefix(bot_modules) -> None:
-    client = bot_modules.storage.InMemoryValkey()
-    context = SimpleNamespace(
-        application=SimpleNamespace(
-            bot_data={"valkey_client": client, "valkey_prefix": "custom"}
-        )
+def test_get_application_store_uses_configured_prefix(
+    bot_modules, valkey_client
+) -> None:
+    context = FakeContext(
+        FakeApplication({"valkey_client": valkey_client, "valkey_prefix": "custom"})
     )
 
     store = bot_modules.storage.get_application_store(context)
     store.set_fields(7, position="Tester")
 
-    stored = client.hgetall("custom:session:7")
+    stored = valkey_client.hgetall("custom:session:7")
     assert stored["position"] == "Tester"
+
+
+def test_application_store_get_fields_returns_subset(
+    media_tmp: Path, bot_modules, valkey_client
+) -> None:
+    store = bot_modules.storage.ApplicationStore(valkey_client, prefix="test")
+    store.init_session(
+        5,
+        {
+            "session_key": "session-5",
+            "session_dir": media_tmp,
+            "photos": ["session-5/photo_01.jpg"],
+            "position": "Boots",
+            "_photo_prompt_message_id": 12,
+        },
+    )
+
+    session = store.get_fields(5, "session_dir", "photos", "position", "price")
+
+    assert session == {
+        "session_dir": media_tmp,
+        "photos": ["session-5/photo_01.jpg"],
+        "position": "Boots",
+    }
+    assert store.get_fields(6, "position", "photos") == {}
+
+
+def test_in_memory_pipeline_defers_commands_until_execute(valkey_client) -> None:
+    with valkey_client.pipeline() as pipe:
+        pipe.hset("record", mapping={"field": "value"})
+        pipe.sadd("records", "record")
+        assert valkey_client.hgetall("record") == {}
+        results = pipe.execute()
+
+    assert results == [None, 1]
+    assert valkey_client.hgetall("record") == {"field": "value"}
+    assert valkey_client.smembers("records") == {"record"}
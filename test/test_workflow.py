@@ -1,166 +1,188 @@
 from __future__ import annotations
 
-import asyncio
-import types
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
+import pytest
 
-def test_get_contacts_persists_submission(tmp_path: Path, bot_modules) -> None:
-    workflow = bot_modules.workflow
-    storage = bot_modules.storage
-    client = storage.InMemoryValkey()
-    prefix = "test"
-    user_id = 99
-    session_key = "session-1"
+from .utils import (
+    DummyMessage,
+    FakeApplication,
+    FakeChat,
+    FakeContext,
+    FakeUpdate,
+    FakeUser,
+    expected_message,
+    run_to_end,
+    snapshot,
+)
 
-    session_dir = tmp_path / "session"
-    session_dir.mkdir()
-    photo_path = session_dir / "photo.jpg"
-    photo_path.write_text("data", encoding="utf-8")
-
-    initial_data = {
-        "session_key": session_key,
-        "session_dir": session_dir,
-        "photos": [photo_path],
-        "position": "Coat",
-        "condition": "Used",
-        "size": "M",
-        "material": "Wool",
-        "description": "Warm coat",
-        "price": "1000",
-    }
+_PREFIX = "test"
 
-    store = storage.ApplicationStore(client, prefix=prefix)
-    store.init_session(user_id, initial_data)
 
-    class DummyMessage:
-        def __init__(self, text: str) -> None:
-            self.text = text
-            self.replies: list[tuple[str, str | None]] = []
+class DummyBot:
+    async def send_message(
+        self, chat_id: int, text: str, parse_mode: str | None = None
+    ) -> None:
+        pass
 
-        async def reply_text(self, text: str, parse_mode: str | None = None) -> None:
-            self.replies.append((text, parse_mode))
+    async def send_media_group(self, chat_id: int, media: list[object]) -> None:
+        pass
 
-    class DummyBot:
-        async def send_message(
-            self, chat_id: int, text: str, parse_mode: str | None = None
-        ) -> None:
-            pass
+    async def send_photo(self, chat_id: int, photo: object) -> None:
+        pass
 
-        async def send_media_group(self, chat_id: int, media: list[object]) -> None:
-            pass
 
-        async def send_photo(self, chat_id: int, photo: object) -> None:
-            pass
+@pytest.fixture
+def workflow_context(valkey_client, local_media_storage) -> FakeContext:
+    bot_data = {
+        "valkey_client": valkey_client,
+        "valkey_prefix": _PREFIX,
+        "moderator_chat_ids": [],
+        "media_storage": local_media_storage,
+    }
+    return FakeContext(FakeApplication(bot_data), bot=DummyBot())
+
+
+@pytest.mark.parametrize(
+    "has_session", [True, False], ids=["persists_submission", "missing_session"]
+)
+async def test_get_contacts(
+    has_session: bool,
+    media_tmp: Path,
+    bot_modules,
+    valkey_client,
+    workflow_context,
+) -> None:
+    workflow = bot_modules.workflow
+    user_id = 99
+    session_key = "session-1"
 
-    user = types.SimpleNamespace(
+    if has_session:
+        session_dir = media_tmp / "session"
+        store = bot_modules.storage.ApplicationStore(valkey_client, prefix=_PREFIX)
+        store.init_session(
+            user_id,
+            {
+                "session_key": session_key,
+                "session_dir": session_dir,
+                "photos": [session_dir / "photo.jpg"],
+                "position": "Coat",
+                "condition": "Used",
+                "size": "M",
+                "material": "Wool",
+                "description": "Warm coat",
+                "price": "1000",
+            },
+        )
+
+    user = FakeUser(
         id=user_id,
         username="tester",
         first_name="Test",
         last_name="User",
     )
     message = DummyMessage("@seller")
-    chat = types.SimpleNamespace(id=user_id)
-    update = types.SimpleNamespace(
-        message=message,
-        effective_user=user,
-        effective_chat=chat,
-    )
-
-    media_storage = bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
-
-    bot_data = {
-        "valkey_client": client,
-        "valkey_prefix": prefix,
-        "moderator_chat_ids": [],
-        "media_storage": media_storage,
-    }
-
-    context = types.SimpleNamespace(
-        application=types.SimpleNamespace(bot_data=bot_data),
-        bot=DummyBot(),
-    )
+    update = FakeUpdate(message, effective_user=user, effective_chat=FakeChat(user_id))
 
-    async def run_workflow() -> None:
-        result = await workflow.get_contacts(update, context)
-        assert result is workflow.ConversationHandler.END
+    await run_to_end(workflow, update, workflow_context)
 
-    asyncio.run(run_workflow())
+    if not has_session:
+        assert message.replies == [(expected_message("general.session_missing"), None)]
+        return
 
     assert len(message.replies) == 2
     summary_text, summary_parse_mode = message.replies[0]
     assert summary_parse_mode == "Markdown"
-    assert summary_text.startswith(workflow.get_message("workflow.summary_header"))
+    assert summary_text.startswith(expected_message("workflow.summary_header"))
     assert (
-        workflow.get_message("workflow.summary_contacts", value="@seller")
-        in summary_text
+        expected_message("workflow.summary_contacts", value="@seller") in summary_text
     )
 
     acknowledgement_text, acknowledgement_parse_mode = message.replies[1]
     assert acknowledgement_parse_mode == "Markdown"
-    assert acknowledgement_text == workflow.get_message("workflow.submission_received")
-
-    record = client.hgetall(f"{prefix}:{session_key}")
-    assert record["contacts"] == "@seller"
-    assert record["user_id"] == str(user_id)
-    assert f"{prefix}:{session_key}" in client.smembers(
-        f"{prefix}:user:{user_id}:applications"
+    assert acknowledgement_text == expected_message("workflow.submission_received")
+
+    record_key = f"{_PREFIX}:{session_key}"
+    user_key = f"{_PREFIX}:user:{user_id}:applications"
+    index_key = f"{_PREFIX}:applications"
+    session_state_key = f"{_PREFIX}:session:{user_id}"
+    snap = snapshot(
+        valkey_client,
+        hashes=(record_key, session_state_key),
+        sets=(user_key, index_key),
     )
-    assert f"{prefix}:{session_key}" in client.smembers(f"{prefix}:applications")
-    assert client.hgetall(f"{prefix}:session:{user_id}") == {}
+    assert snap[record_key]["contacts"] == "@seller"
+    assert snap[record_key]["user_id"] == str(user_id)
+    assert record_key in snap[user_key]
+    assert record_key in snap[index_key]
+    assert snap[session_state_key] == {}
 
 
-def test_get_contacts_without_session_sends_warning(
-    tmp_path: Path, bot_modules
+async def test_get_contacts_falls_back_to_individual_photos(
+    bot_modules, valkey_client, local_media_storage, workflow_context
 ) -> None:
     workflow = bot_modules.workflow
-    storage = bot_modules.storage
-    client = storage.InMemoryValkey()
-
-    class DummyMessage:
-        def __init__(self, text: str) -> None:
-            self.text = text
-            self.replies: list[str] = []
-
-        async def reply_text(self, text: str, parse_mode: str | None = None) -> None:
-            self.replies.append(text)
-
-    class DummyBot:
-        async def send_message(
-            self, chat_id: int, text: str, parse_mode: str | None = None
-        ) -> None:
-            pass
-
-        async def send_media_group(self, chat_id: int, media: list[object]) -> None:
-            pass
+    user_id = 99
+    moderator_chat_id = 777
+    payloads = [b"first", b"second"]
+
+    session = local_media_storage.get_session("session-1")
+    handles = []
+    for index, payload in enumerate(payloads, start=1):
+        photo_path = local_media_storage.allocate_path(session, f"photo_{index}.jpg")
+        photo_path.parent.mkdir(parents=True, exist_ok=True)
+        photo_path.write_bytes(payload)
+        handles.append(local_media_storage.finalize_upload(session, photo_path))
+
+    store = bot_modules.storage.ApplicationStore(valkey_client, prefix=_PREFIX)
+    store.init_session(
+        user_id,
+        {"session_key": "session-1", "photos": handles, "position": "Coat"},
+    )
 
-        async def send_photo(self, chat_id: int, photo: object) -> None:
-            pass
+    bot = SimpleNamespace(
+        send_media_group=AsyncMock(side_effect=workflow.BadRequest("too many")),
+        send_photo=AsyncMock(),
+        send_message=AsyncMock(),
+    )
+    workflow_context.bot = bot
+    workflow_context.application.bot_data["moderator_chat_ids"] = [moderator_chat_id]
 
-    user = types.SimpleNamespace(id=5)
     message = DummyMessage("@seller")
-    update = types.SimpleNamespace(
-        message=message, effective_user=user, effective_chat=None
+    update = FakeUpdate(
+        message, effective_user=FakeUser(user_id), effective_chat=FakeChat(user_id)
     )
 
-    media_storage = bot_modules.media_storage.LocalMediaStorage(tmp_path / "media")
-
-    bot_data = {
-        "valkey_client": client,
-        "valkey_prefix": "test",
-        "moderator_chat_ids": [],
-        "media_storage": media_storage,
-    }
-
-    context = types.SimpleNamespace(
-        application=types.SimpleNamespace(bot_data=bot_data),
-        bot=DummyBot(),
+    await run_to_end(workflow, update, workflow_context)
+
+    assert [
+        awaited.kwargs["chat_id"] for awaited in bot.send_media_group.await_args_list
+    ] == [
+        user_id,
+        moderator_chat_id,
+    ]
+    sent = [
+        (awaited.kwargs["chat_id"], awaited.kwargs["photo"].getvalue())
+        for awaited in bot.send_photo.await_args_list
+    ]
+    assert sent == [
+        (user_id, payloads[0]),
+        (user_id, payloads[1]),
+        (moderator_chat_id, payloads[0]),
+        (moderator_chat_id, payloads[1]),
+    ]
+
+    bot.send_message.assert_awaited_once()
+    forwarded = bot.send_message.await_args.kwargs
+    assert forwarded["chat_id"] == moderator_chat_id
+    assert forwarded["text"].startswith(expected_message("workflow.summary_header"))
+    assert (
+        expected_message("workflow.summary_contacts", value="@seller")
+        in forwarded["text"]
+    )
+    assert message.replies[-1] == (
+        expected_message("workflow.submission_received"),
+        "Markdown",
     )
-
-    async def run_workflow() -> None:
-        result = await workflow.get_contacts(update, context)
-        assert result is workflow.ConversationHandler.END
-
-    asyncio.run(run_workflow())
-
-    assert message.replies == [workflow.get_message("general.session_missing")]
@@ -1,29 +1,145 @@
 from __future__ import annotations
 
+from collections import deque
 from contextlib import contextmanager
-from typing import Any, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
 
 
-def extract_messages(events: list[object]) -> list[str]:
-    messages: list[str] = []
-    for event in events:
-        try:
-            record = event.record  # type: ignore[attr-defined]
-            messages.append(str(record["message"]))
-        except AttributeError:
-            messages.append(str(event))
-    return messages
+@dataclass(slots=True)
+class FakeUser:
+    id: int
+    username: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+
+
+@dataclass(slots=True)
+class FakeChat:
+    id: int
+
+
+@dataclass(slots=True)
+class FakeUpdate:
+    message: Any = None
+    effective_user: Any = None
+    effective_chat: FakeChat | None = None
+    callback_query: Any = None
+
+
+@dataclass(slots=True)
+class FakeApplication:
+    bot_data: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class FakeContext:
+    """Handler context exposing ``application.bot_data``, ``bot`` and ``user_data``."""
+
+    application: FakeApplication
+    bot: Any = None
+    user_data: dict[str, Any] = field(default_factory=dict)
+
+
+class DummyMessage:
+    """Incoming message double that records ``(text, parse_mode)`` replies."""
+
+    def __init__(self, text: str = "") -> None:
+        self.text = text
+        self.replies: list[tuple[str, str | None]] = []
+
+    async def reply_text(self, text: str, parse_mode: str | None = None) -> None:
+        self.replies.append((text, parse_mode))
 
 
 @contextmanager
-def capture_logs(logger: Any, level: str = "DEBUG") -> Iterator[list[object]]:
-    events: list[object] = []
+def capture_logs(
+    logger: Any, level: str = "DEBUG", maxlen: int | None = None
+) -> Iterator[deque[str]]:
+    """Collect the message text of ``logger`` records emitted inside the block.
+
+    Every message is kept unless ``maxlen`` asks for a ring buffer of the
+    newest records. The sink is added to the current process's loguru logger
+    and removed on exit, so handler ids never leak between xdist workers or
+    tests.
+    """
 
-    def sink(message: object) -> None:
-        events.append(message)
+    messages: deque[str] = deque(maxlen=maxlen)
 
-    handler_id = logger.add(sink, level=level)
+    def sink(message: Any) -> None:
+        messages.append(message.record["message"])
+
+    handler_id = logger.add(sink, level=level, format="{message}")
     try:
-        yield events
+        yield messages
     finally:
         logger.remove(handler_id)
+
+
+def seed(
+    client: Any,
+    *,
+    hashes: Mapping[str, Mapping[str, str]] | None = None,
+    sets: Mapping[str, Iterable[str]] | None = None,
+) -> None:
+    """Populate ``client`` with hashes and set members in one pipeline."""
+
+    with client.pipeline() as pipe:
+        for key, mapping in (hashes or {}).items():
+            pipe.hset(key, mapping=dict(mapping))
+        for key, members in (sets or {}).items():
+            for member in members:
+                pipe.sadd(key, member)
+        pipe.execute()
+
+
+def snapshot(
+    client: Any,
+    *,
+    hashes: Iterable[str] = (),
+    sets: Iterable[str] = (),
+) -> dict[str, Any]:
+    """Read ``hashes`` and ``sets`` from ``client`` in one pipeline, keyed by name."""
+
+    hashes, sets = list(hashes), list(sets)
+    with client.pipeline() as pipe:
+        for key in hashes:
+            pipe.hgetall(key)
+        for key in sets:
+            pipe.smembers(key)
+        results = pipe.execute()
+    return dict(zip(hashes + sets, results))
+
+
+def make_minio_storage(
+    bot_modules: Any, tmp_path: Path, bucket: str = "test-bucket"
+) -> tuple[Any, Any]:
+    """Return a stub Minio client and a ``MinioMediaStorage`` backed by it."""
+
+    client = bot_modules.media_storage.Minio(
+        "minio", access_key=None, secret_key=None, secure=False
+    )
+    storage = bot_modules.media_storage.MinioMediaStorage(
+        client,
+        bucket=bucket,
+        cache_dir=tmp_path / "cache",
+    )
+    return client, storage
+
+
+@lru_cache(maxsize=None)
+def expected_message(key: str, **params: Any) -> str:
+    """Return the catalog message ``key`` formatted with ``params``, cached per call."""
+
+    from bot.messages import get_message
+
+    return get_message(key, **params)
+
+
+async def run_to_end(workflow: Any, update: Any, context: Any) -> None:
+    """Run ``workflow.get_contacts`` and assert the conversation ended."""
+
+    result = await workflow.get_contacts(update, context)
+    assert result is workflow.ConversationHandler.END